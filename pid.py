@@ -24,12 +24,29 @@ import itertools
 import contextlib
 import copy
 import re
-from collections import deque, ChainMap, Counter
+from collections import deque, Counter
+
+# numpy is optional; it is only needed for the batch (many samples) methods
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class PID:
     """Simple PID control."""
 
+    # _calculate() does the standard term computations inline, which is
+    # only correct if none of the individual term methods are overridden.
+    # This is determined once per class (see __init_subclass__)
+    _TERMS = ('_error', '_proportional', '_integral', '_derivative', '_u')
+    _inline_terms = True
+
+    def __init_subclass__(cls, /, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._inline_terms = all(
+            getattr(cls, a) is getattr(PID, a) for a in PID._TERMS)
+
     def __init__(self, /, *, Kp=0, Ki=0, Kd=0, dt=None):
         """Create a PID controller with the given parameters.
 
@@ -80,15 +97,92 @@ class PID:
             self.dt = dt
         return self._calculate()
 
+    def pid_many(self, pvs, dts=None):
+        """Run pid() over a whole sequence of pvs; return array of u values.
+
+        Requires numpy. The result is the same as calling pid() once per pv,
+        including the resulting state (integration, last_pid, etc), but
+        for a plain PID it is computed with vectorized numpy operations.
+
+        'dts' can be a sequence (one dt per pv), a single value used for
+        every pv, or omitted (None) to re-use the previous dt.
+
+        If there are modifiers (PIDPlus) they need to see every step, so
+        in that case this simply calls pid() once per pv. The same goes
+        for a subclass that overrides pid(), _calculate(), or any of the
+        term methods (_error, _integral, etc).
+
+        A single (scalar) pv is treated as a sequence of one.
+        """
+        if np is None:
+            raise ImportError("pid_many() requires numpy")
+
+        pvs = np.atleast_1d(np.asarray(pvs, dtype=float))
+        if pvs.ndim != 1:
+            raise ValueError(f"pvs must be one-dimensional, not {pvs.shape}")
+        if dts is None:
+            if self.dt is None:
+                raise TypeError("no dt given and no previous dt to re-use")
+            dts = self.dt
+        dts = np.broadcast_to(np.asarray(dts, dtype=float), pvs.shape)
+
+        if len(pvs) == 0:
+            return np.empty(0)
+
+        if (getattr(self, 'modifiers', ()) or not self._inline_terms or
+                type(self).pid is not PID.pid or
+                type(self)._calculate not in (PID._calculate,
+                                              PIDPlus._calculate)):
+            # plain floats in, so the state is the same as with pid() calls
+            return np.array([self.pid(pv.item(), dt.item())
+                             for pv, dt in zip(pvs, dts)])
+
+        if np.any(dts == 0):
+            raise ValueError(f"Cannot compute D term with zero dt")
+
+        e = self.setpoint - pvs
+
+        # The integration is seeded into the cumsum (rather than added
+        # afterwards) so that the floating point additions happen in the
+        # same order as they would have with one pid() call at a time.
+        integ = np.cumsum(np.concatenate(([self.integration], e * dts)))[1:]
+
+        d = np.empty_like(pvs)
+        d[0] = (self.previous_pv - pvs[0]) / dts[0]
+        d[1:] = (pvs[:-1] - pvs[1:]) / dts[1:]
+
+        self.pv = self.previous_pv = pvs[-1].item()
+        self.dt = dts[-1].item()
+        self.integration = integ[-1].item()
+        self.last_pid = (e[-1].item(), self.integration, d[-1].item())
+        return (e * self.Kp) + (integ * self.Ki) + (d * self.Kd)
+
     def _calculate(self):
         """Return control value ('u') for current state."""
         # NOTE: individually broken out into functions for reuse in PIDPlus
-        e = self._error()
-        p = self._proportional(e)
-        i = self._integral(e)
-        d = self._derivative(e)
-        self.last_pid = (p, i, d)
-        return self._u(p, i, d)
+        #       and for subclasses to override; if any are overridden they
+        #       must be used. Otherwise it is all done in one step, below.
+        if not self._inline_terms:
+            e = self._error()
+            p = self._proportional(e)
+            i = self._integral(e)
+            d = self._derivative(e)
+            self.last_pid = (p, i, d)
+            return self._u(p, i, d)
+
+        if self.dt == 0:
+            raise ValueError(f"Cannot compute D term with zero dt")
+
+        # Everything inlined here: one frame per tick instead of a call
+        # per term. This must stay equivalent to the individual functions.
+        pv = self.pv
+        dt = self.dt
+        e = self.setpoint - pv
+        i = self.integration = self.integration + (e * dt)
+        d = (self.previous_pv - pv) / dt
+        self.previous_pv = pv
+        self.last_pid = (e, i, d)
+        return (e * self.Kp) + (i * self.Ki) + (d * self.Kd)
 
     def _error(self):
         """Return the (unweighted) error calculation."""
@@ -145,6 +239,83 @@ class PID:
         return s + ")"
 
 
+#
+# A PIDArray is many independent plain PID controllers, stepped together.
+# Each per-controller value is one element of a numpy array, so one
+# pid() call computes every controller with a handful of array operations.
+#
+class PIDArray:
+    """Many plain PID controllers, computed together with numpy."""
+
+    def __init__(self, n, /, *, Kp=0, Ki=0, Kd=0, dt=None):
+        """Create 'n' PID controllers with the given parameters.
+
+        Kp, Ki, Kd, dt are as for PID but each can be a single value (used
+        for all n controllers) or a sequence of n values. Requires numpy.
+        """
+        if np is None:
+            raise ImportError("PIDArray requires numpy")
+        self.n = n
+        self.Kp = self._nvalues(Kp)
+        self.Ki = self._nvalues(Ki)
+        self.Kd = self._nvalues(Kd)
+        self.dt = dt if dt is None else self._nvalues(dt)
+        self.initial_conditions(pv=0, setpoint=0)
+
+    def _nvalues(self, v):
+        """Return v as a (new) array of n floats; v can be one value."""
+        return np.broadcast_to(np.asarray(v, dtype=float), (self.n,)).copy()
+
+    def initial_conditions(self, /, *, pv=None, setpoint=None):
+        """Establish initial conditions, as in PID. Values can be arrays."""
+        if setpoint is not None:
+            self.setpoint = self._nvalues(setpoint)
+
+        if pv is not None:
+            self.integration = np.zeros(self.n)
+            self.previous_pv = self._nvalues(pv)
+            self.pv = self.previous_pv.copy()
+
+        self.last_pid = (np.zeros(self.n), np.zeros(self.n), np.zeros(self.n))
+
+    def pid(self, pvs, dt=None):
+        """Return array of n control values for the n pvs, like PID.pid()."""
+        self.pv = self._nvalues(pvs)
+        if dt is not None:
+            self.dt = self._nvalues(dt)
+
+        # this is PID._calculate, elementwise (and in the same order so
+        # the results are identical to n separate PID objects)
+        pv = self.pv
+        dt = self.dt
+        if np.any(dt == 0):
+            raise ValueError(f"Cannot compute D term with zero dt")
+        e = self.setpoint - pv
+        i = self.integration = self.integration + (e * dt)
+        d = (self.previous_pv - pv) / dt
+        self.previous_pv = pv
+        self.last_pid = (e, i, d)
+        return (e * self.Kp) + (i * self.Ki) + (d * self.Kd)
+
+    def __len__(self):
+        return self.n
+
+    def to_pid(self, nth):
+        """Return a PID that is a copy of the nth controller (and state)."""
+        z = PID(Kp=self.Kp[nth].item(), Ki=self.Ki[nth].item(),
+                Kd=self.Kd[nth].item(),
+                dt=None if self.dt is None else self.dt[nth].item())
+        z.setpoint = self.setpoint[nth].item()
+        z.pv = self.pv[nth].item()
+        z.previous_pv = self.previous_pv[nth].item()
+        z.integration = self.integration[nth].item()
+        z.last_pid = tuple(a[nth].item() for a in self.last_pid)
+        return z
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.n})"
+
+
 #
 # A PIDPlus is a PID that supports "modifiers" (PIDModifier subclasses).
 # PIDModifiers can enhance/alter the base PID calculations and outputs.
@@ -164,18 +335,10 @@ class PIDPlus(PID):
                              setpoint ramping, etc.
         """
 
-        if modifiers is None:
-            self.modifiers = tuple()    # degenerate case; essentially PID()
-        else:
-            # force modifiers to be a sequence (tuple), possibly zero length.
-            # Note: modifiers can be a naked PIDModifier which is auto
-            #       converted into a tuple of length 1.
-            try:
-                self.modifiers = tuple(modifiers)
-            except TypeError:
-                self.modifiers = (modifiers,)
+        # NOTE: see the modifiers property for the tuple conversion etc
+        self.modifiers = modifiers
 
-        # Tracks nested notification level (see notify()/_notify())
+        # Tracks nested notification level (see notify())
         self.nn_level = 0
 
         # let each modifier know it has been attached to this pid
@@ -201,6 +364,78 @@ class PIDPlus(PID):
         #       and that should be reset by this event.
         self.notify(PIDHookInitialConditions(*args, **kwargs))
 
+    # .modifiers is a property so the cached handlers can be reset on changes
+    @property
+    def modifiers(self):
+        return self._modifiers
+
+    @modifiers.setter
+    def modifiers(self, mods):
+        if mods is None:
+            mods = tuple()          # degenerate case; essentially PID()
+        else:
+            # force modifiers to be a sequence (tuple), possibly zero length.
+            # Note: modifiers can be a naked PIDModifier which is auto
+            #       converted into a tuple of length 1.
+            try:
+                mods = tuple(mods)
+            except TypeError:
+                mods = (mods,)
+        self._modifiers = mods
+        self.handlers_changed()
+
+    def handlers_changed(self):
+        """Discard cached handler lookups.
+
+        Handler methods, per event class, are looked up (once) in
+        _handlers_for() and cached. The cache is discarded any time the
+        modifiers change. A modifier whose idle_for() answer changes must
+        call this (see PIDModifier.idle_for and, e.g., SetpointRamp).
+        """
+        self._handlers = {}
+        self._handled = {}
+
+    def _is_handled(self, eventclass):
+        """Return True if any modifier really handles eventclass events.
+
+        A modifier whose handler is the no-op PIDModifier.PH_default
+        does not count.
+        """
+        return bool(self._handlers_for(eventclass))
+
+    def _handlers_for(self, eventclass, modifiers=None):
+        """Return tuple of (nth, modifier, handler) for eventclass events.
+
+        'nth' is the position of the modifier in the modifiers list.
+        Modifiers whose handler is the no-op PIDModifier.PH_default, or
+        that are (currently) idle_for() the eventclass, are omitted, so
+        they are not called at all.
+
+        The handlers for self.modifiers are cached; handlers for an
+        explicit modifiers list (which happens only in HookStop/Failure
+        processing) are looked up every time.
+        """
+        if modifiers is not None:
+            hname = eventclass.handlername()
+            noop = PIDModifier.PH_default
+            nmhs = []
+            for nth, m in enumerate(modifiers):
+                h = getattr(m, hname, None)
+                if h is None:
+                    h = m.PH_default
+                if getattr(h, '__func__', h) is noop:
+                    continue
+                idle_for = getattr(m, 'idle_for', None)
+                if idle_for is None or not idle_for(eventclass):
+                    nmhs.append((nth, m, h))
+            return tuple(nmhs)
+        try:
+            return self._handlers[eventclass]
+        except KeyError:
+            h = self._handlers[eventclass] = self._handlers_for(
+                eventclass, self._modifiers)
+            return h
+
     # .setpoint becomes a property so PIDModifiers can be notified of changes
     @property
     def setpoint(self):
@@ -217,7 +452,10 @@ class PIDPlus(PID):
         if v == sp_from:
             return                    # no notifications on no-change 'changes'
 
-        # the notification protocol
+        # the notification protocol (but skip it if no one is listening)
+        if not self._is_handled(PIDHookSetpointChange):
+            self._setpoint = v
+            return
         event = self.notify(PIDHookSetpointChange(sp_from=sp_from, sp_to=v))
         self._setpoint = v if event.sp is None else event.sp
 
@@ -240,20 +478,45 @@ class PIDPlus(PID):
         #        Last opportunity to bash 'u' (only).
         #
 
+        # Any of these events that no modifier handles (other than with the
+        # no-op PIDModifier.PH_default) is simply not generated; the values
+        # are carried from one step to the next in local variables instead.
+        # This makes, e.g., a PIDPlus that only has an I_Windup cost one
+        # event (ModifyTerms) per pid() rather than three.
+
+        # If none of them are handled, this is just a plain PID calculation,
+        # which PID._calculate does (including using any overridden term
+        # methods, e.g., _u, in a subclass; see PID._inline_terms).
+        # (whether any are handled is cached under their common base class)
+        try:
+            calc_handled = self._handled[_PIDHook_Calc]
+        except KeyError:
+            calc_handled = self._handled[_PIDHook_Calc] = any(
+                self._is_handled(c) for c in (
+                    PIDHookBaseTerms, PIDHookModifyTerms, PIDHookCalculateU))
+        if not calc_handled:
+            return PID._calculate(self)
+
         # FIRST PIDHookEvent: BaseTerms
         # Run all the BaseTerms events which may (or may not) establish
         # some of the process control values (e/p/i/d/u).
-        cx = self.notify(PIDHookBaseTerms(dt=self.dt))
+        if self._is_handled(PIDHookBaseTerms):
+            cx = self.notify(PIDHookBaseTerms(dt=self.dt))
+            e, p, i, d, u = cx.e, cx.p, cx.i, cx.d, cx.u
+        else:
+            cx = None
+            e = p = i = d = u = None
 
         # Anything not supplied by a BaseTerms modifier is calculated
         # the standard way here:
-        if cx.e is None:
-            cx.e = self._error()
-        for attr, f in (('p', self._proportional),
-                        ('i', self._integral),
-                        ('d', self._derivative)):
-            if getattr(cx, attr) is None:
-                setattr(cx, attr, f(cx.e))
+        if e is None:
+            e = self._error()
+        if p is None:
+            p = self._proportional(e)
+        if i is None:
+            i = self._integral(e)
+        if d is None:
+            d = self._derivative(e)
 
         # NOTE: 'e' is not used further after this point, unless a modifier
         #       looks at it specifically.
@@ -262,27 +525,45 @@ class PIDPlus(PID):
         # This is where most modifiers do their work, given the "raw"
         # p/i/d/ values (though they potentially were supplied by
         # a modifier, not by the normal calculation).
-        cx = self.notify(PIDHookModifyTerms(**cx.attrs()))
+        if self._is_handled(PIDHookModifyTerms):
+            cx = self.notify(PIDHookModifyTerms(
+                **self._carry_terms(cx, e=e, p=p, i=i, d=d, u=u)))
+            p, i, d, u = cx.p, cx.i, cx.d, cx.u
 
         # Generally 'u' calculation should be overridden in a CalculateU.
         # See, for example, BangBang. But allow for it in ModifyTerms by
-        # testing for it. By far the common case is cx.u is still None here.
-        if cx.u is None:
-            cx.u = self._u(cx.p, cx.i, cx.d)
+        # testing for it. By far the common case is u is still None here.
+        if u is None:
+            u = self._u(p, i, d)
 
         # At this point p/i/d are fixed (note: read-only in CalculateU).
         # Record last_pid accordingly. Caution: Because modifiers can
         # perform arbitrary calculations to provide a 'u' value, the
         # relevance of last_pid is less clear in a PIDPlus. Nevertheless:
-        self.last_pid = (cx.p, cx.i, cx.d)
+        self.last_pid = (p, i, d)
 
         # THIRD (final) PIDHookEvent: CalculateU
         # This is where a modifier such as BangBang can do violence to 'u'
         # Note: attrs from the ModifyTerms are cloned to the CalculateU
-        cx = self.notify(PIDHookCalculateU(**cx.attrs()))
+        if self._is_handled(PIDHookCalculateU):
+            cx = self.notify(PIDHookCalculateU(
+                **self._carry_terms(cx, e=e, p=p, i=i, d=d, u=u)))
+            u = cx.u
 
         # Whatever 'u' came through all that ... that's the result!
-        return cx.u
+        return u
+
+    def _carry_terms(self, cx, **terms):
+        """Return the attributes to carry forward into the next calc event.
+
+        The e/p/i/d/u values are given as keyword arguments. If there was
+        a prior calc event (cx) its attributes also carry forward, which
+        includes any new attributes that modifiers put there.
+        """
+        if cx is None:
+            terms['dt'] = self.dt
+            return terms
+        return {**vars(cx), **terms}
 
     def notify(self, event, /, *, modifiers=None):
         """Invoke the notification handler for (by default) all modifiers.
@@ -293,18 +574,7 @@ class PIDPlus(PID):
         when the returned event is needed even after the notify()
         """
 
-        # This dance allows EventPrint to indent nested event notifications
-        self.nn_level += 1
-        try:
-            rv = self._notify(event, modifiers=modifiers)
-        finally:
-            self.nn_level -= 1
-        return rv
-
-    def _notify(self, event, /, *, modifiers=None):
-        """The guts of notify(). (notify() itself just maintains nn_level)"""
-        if modifiers is None:
-            modifiers = self.modifiers
+        nmhs = self._handlers_for(event.__class__, modifiers)
 
         # automate the setting of 'pid' as a convenience
         # NOTE: if this was copied (e.g., ModifyTerms from BaseTerms)
@@ -312,31 +582,39 @@ class PIDPlus(PID):
         if not hasattr(event, 'pid'):
             event.pid = self
 
-        for nth, m in enumerate(modifiers):
-            h = getattr(m, event.handlername(), getattr(m, 'PH_default'))
-            try:
-                h(event)        # ... this calls m.PH_foo(event)
-            except HookStop:
-                # stop propagating; notify the REST of modifiers of THAT
-                self.notify(
-                    PIDHookHookStopped(
-                        event=event,     # the event that was HookStop'd
-                        stopper=m,       # whodunit
-                        nth=nth,         # in case more than one 'm'
-                        modifiers=modifiers
-                    ), modifiers=modifiers[nth+1:])
-                break
-            except Exception as exc:
-                # some modifier bailed out. It is unlikely to be helpful
-                # to let other modifiers know, but... do it anyway
-                self.notify(PIDHookFailure(
-                        event=event,     # the event that caused exc
-                        exc=exc,         # the exception
-                        stopper=m,       # whodunit
-                        nth=nth,         # in case more than one 'm'
-                        modifiers=modifiers
-                    ), modifiers=modifiers[nth+1:])
-                raise
+        # This dance allows EventPrint to indent nested event notifications
+        self.nn_level += 1
+        try:
+            for nth, m, h in nmhs:
+                try:
+                    h(event)        # ... this calls m.PH_foo(event)
+                except HookStop:
+                    # stop propagating; notify the REST of modifiers of THAT
+                    if modifiers is None:
+                        modifiers = self.modifiers
+                    self.notify(
+                        PIDHookHookStopped(
+                            event=event,     # the event that was HookStop'd
+                            stopper=m,       # whodunit
+                            nth=nth,         # in case more than one 'm'
+                            modifiers=modifiers
+                        ), modifiers=modifiers[nth+1:])
+                    break
+                except Exception as exc:
+                    # some modifier bailed out. It is unlikely to be helpful
+                    # to let other modifiers know, but... do it anyway
+                    if modifiers is None:
+                        modifiers = self.modifiers
+                    self.notify(PIDHookFailure(
+                            event=event,     # the event that caused exc
+                            exc=exc,         # the exception
+                            stopper=m,       # whodunit
+                            nth=nth,         # in case more than one 'm'
+                            modifiers=modifiers
+                        ), modifiers=modifiers[nth+1:])
+                    raise
+        finally:
+            self.nn_level -= 1
         return event            # notational convenience
 
     def __repr__(self):
@@ -417,143 +695,108 @@ class _PIDHookEvent:
     @classmethod
     def handlername(cls):
         """Return deduced handler name for the event class."""
+        # NOTIFYHANDLER is either set explicitly by the class, or was
+        # established automatically when the class was created; see
+        # _autoname() and __init_subclass__
         try:
-            # A subclass can explicitly set a name other than the
-            # automatic name, if it wants to. Return that if it exists.
             return cls.NOTIFYHANDLER
         except AttributeError:
-            # Nothing explicitly set; the auto naming works like this:
-            #   PIDHookFooBar becomes PH_foo_bar
-            # Essentially ^PIDHook becomes PH and any upper case
-            # letter becomes an underbar and corresponding lower case.
-            # Subclass names that don't start with PIDHook are not translated
-            # at all; the class should have set NOTIFYHANDLER instead.
-            hname = cls.__name__
-            if not hname.startswith('PIDHook'):
-                raise AttributeError(f"Cannot autoname from {hname}")
-            cls.NOTIFYHANDLER = 'PH'
-            for c in hname[7:]:
-                if c.isupper():
-                    cls.NOTIFYHANDLER += '_'
-                cls.NOTIFYHANDLER += c.lower()
-        return cls.NOTIFYHANDLER
-
-    # Property/descriptor implementing read-only-ness
-    class _ReadOnlyDescr:
-        _PVTPREFIX = "_PVT_ReadOnly__"
-        _WRITEONCE = object()
-
-        # Factory for annointing PIDHookEvent classes with descriptors
-        # for any attributes that are enforced as read-only.
-        #    cls      -- will be (of course) this class
-        #    attrname -- name of a (to be set up) read-only attribute
-        #    value    -- its initial value
-        #    obj      -- the underlying PIDHookEvent OBJECT (not class)
-        #
-        # The obj.__class__ (something like, e.g., PIDHookSetpointChange)
-        # needs a data descriptor property created for this attrname, but
-        # that property should only be created ONCE (per attrname, per class).
-        # In contrast, individual object instances each need, of course,
-        # their own instance variable (object attribute) for the underlying
-        # readonly value; that attribute name is built using _PVTPREFIX to
-        # distinguish it from ordinary (read/write) attrs.
-
-        @classmethod
-        def establish_property(cls, attrname, value=None, /, *, obj=None):
-            """Factory for creating the property descriptors (dynamically)."""
-
-            pidhook_class = obj.__class__   # e.g., PIDHookSetpointChange, etc
-
-            # See if there is already a data descriptor (i.e., if this is
-            # not the first time establish_property() has been called for
-            # this attrname on this cls.
-            try:
-                descriptor = getattr(pidhook_class, attrname)
-            except AttributeError:
-                # this code hasn't run yet, so there is no descriptor for
-                # this attrname in this pidhook_class. Make it.
-
-                descriptor = cls()         # i.e., a _ReadOnlyDescr()
-
-                # If "foo" is an attrname, something 'like' foo needs
-                # to be stored in the object (not the class) as the
-                # underlying read-only value for that instance.
-                # The name is arbitrarily constructed this way and saved
-                # ONCE in the descriptor for this attribute.
-                descriptor._name = cls._PVTPREFIX + attrname
-                descriptor._publicname = attrname
-                # and this establishes the data descriptor on the class
-                setattr(pidhook_class, attrname, descriptor)
-
-            # now can just set the underlying attribute directly.
-            setattr(obj, descriptor._name, value)
-
-        # readonly attributes won't be in (generic) vars(), and their
-        # underlying ("privatized") names will. So vars() is not
-        # (very) helpful. Instead, _Readonly class provides an attrs()
-        # method, which returns all the appropriate attribute names and
-        # their values, including the readonly ones, and not any
-        # of the privatized ("underlying") names.
-        @classmethod
-        def attrs(cls, obj):
-            """Return a dictionary of attributes, finessing readonly stuff."""
-            vd = {}
-            for a, v in vars(obj).items():
-                if a.startswith(cls._PVTPREFIX):
-                    a = a[len(cls._PVTPREFIX):]
-                vd[a] = v
-            return vd
-
-        def __get__(self, obj, objtype=None):
-            if obj is None:
-                return self
-            v = getattr(obj, self._name)
-            if v is self._WRITEONCE:
-                raise AttributeError(
-                    f"{self._publicname} hasn't been set yet")
-            return v
-
-        def __set__(self, obj, value):
-            if getattr(obj, self._name) is self._WRITEONCE:
-                setattr(obj, self._name, value)
-            else:
-                raise TypeError(
-                    f"write to read-only attribute "
-                    f"'{self._publicname}' not allowed")
-
-        def __delete__(self, obj):
-            raise TypeError(
-                f"deletion of read-only attribute "
-                f"'{self._publicname}' not allowed")
-
-    def __init__(self, /, **kwargs):
+            raise AttributeError(
+                f"Cannot autoname from {cls.__name__}") from None
+
+    @staticmethod
+    def _autoname(hname):
+        # The auto naming works like this:
+        #   PIDHookFooBar becomes PH_foo_bar
+        # Essentially ^PIDHook becomes PH and any upper case
+        # letter becomes an underbar and corresponding lower case.
+        # Subclass names that don't start with PIDHook are not translated
+        # at all; the class should set NOTIFYHANDLER instead.
+        if not hname.startswith('PIDHook'):
+            return None
+        return 'PH' + re.sub(r'([A-Z])', r'_\1', hname[7:]).lower()
+
+    # Read-only-ness is enforced by __setattr__/__delattr__. The set of
+    # read-only names for an event is in slot _ro (a slot, so that it
+    # isn't one of the event attributes in __dict__). Event attributes
+    # themselves are ordinary instance (__dict__) attributes, so reading
+    # them - by far the most common operation - costs nothing extra.
+    __slots__ = ('__dict__', '_ro')
+
+    # READONLY is resolved once per class (see __init_subclass__) into:
+    #     _readonly -- frozenset of read-only names (never includes '*')
+    #     _allro    -- True if READONLY has '*'
+    # These are the values for this base class, i.e., READONLY = {'*'}
+    _readonly = frozenset({'pid'})
+    _allro = True
+
+    def __init_subclass__(cls, /, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Name the handler once, here, unless the class set one explicitly
+        if 'NOTIFYHANDLER' not in cls.__dict__:
+            hname = cls._autoname(cls.__name__)
+            if hname is not None:
+                cls.NOTIFYHANDLER = hname
 
         # Also, 'pid' is hardwired read-only
         try:
-            readonly = self.READONLY | {'pid'}
+            readonly = cls.READONLY | {'pid'}
         except TypeError:
             # raise something more helpful if READONLY is not a set
             raise ValueError(
-                f"READONLY must be a set, not '{self.READONLY}'") from None
+                f"READONLY must be a set, not '{cls.READONLY}'") from None
+        cls._allro = '*' in readonly
+        cls._readonly = frozenset(readonly - {'*'})
+
+    def __init__(self, /, **kwargs):
 
         # NOTE: READONLY={'*'} only affects attributes established
         #       by __init__() either as explicit kwargs or via DEFAULTED.
         #       This is by design.
-        for k, v in ChainMap(kwargs, self.DEFAULTED).items():
-            if {k, '*'} & readonly:
-                self._ReadOnlyDescr.establish_property(k, v, obj=self)
-            else:
-                setattr(self, k, v)
+        #
+        # The DEFAULTED names go first (with kwargs overriding their values)
+        # and then any kwargs that weren't in DEFAULTED. This order matters
+        # only because it is the order the attributes show up in repr/str.
+        # (dict.update() keeps the position of keys that already exist)
+        vd = self.__dict__
+        vd.update(self.DEFAULTED)
+        vd.update(kwargs)
+
+        # Any READONLY names not established here are "write-once"; that
+        # works out naturally because they are simply not in __dict__ yet.
+        ro = self._readonly.union(vd) if self._allro else self._readonly
+        object.__setattr__(self, '_ro', ro)
+
+    # NOTE: _ro is read defensively because it does not exist until
+    #       __init__ establishes it. Attributes can be set before that, for
+    #       example by copy.deepcopy()/pickle rebuilding an event, or by a
+    #       subclass __init__ before it calls super().__init__()
+    def __setattr__(self, name, value):
+        if name in getattr(self, '_ro', ()) and name in self.__dict__:
+            raise TypeError(
+                f"write to read-only attribute '{name}' not allowed")
+        object.__setattr__(self, name, value)
 
-        # attrs in READONLY by name but not yet supplied become write-once
-        for k in readonly:
-            if k != '*' and not hasattr(self, k):
-                self._ReadOnlyDescr.establish_property(
-                    k, self._ReadOnlyDescr._WRITEONCE, obj=self)
+    def __delattr__(self, name):
+        # a write-once name that was never written is simply not there
+        if name in getattr(self, '_ro', ()) and name in self.__dict__:
+            raise TypeError(
+                f"deletion of read-only attribute '{name}' not allowed")
+        object.__delattr__(self, name)
+
+    # copy.copy() support, which must carry over the (slot) _ro. This is
+    # also faster than the generic copy mechanism, which matters because
+    # PIDHistory copies every event.
+    def __copy__(self):
+        e2 = object.__new__(self.__class__)
+        object.__setattr__(e2, '_ro', self._ro)
+        e2.__dict__.update(self.__dict__)
+        return e2
 
     def attrs(self):
-        """Built-in vars returns gibberish for readonly's; this doesn't."""
-        return {a: v for a, v in self._ReadOnlyDescr.attrs(self).items()}
+        """Return a dictionary of the event attributes and values."""
+        return dict(self.__dict__)
 
     def __repr__(self):
         s = self.__class__.__name__ + "("
@@ -596,9 +839,11 @@ class _PIDHookEvent:
 #    time either as a kwarg or via DEFAULTED, then it becomes a
 #    "write-once" attribute. The application can write a value to this
 #    attribute later (once), but once written it cannot be changed.
-#    Attempting to read an attribute that is in WRITEONCE state (i.e.,
-#    hasn't been set yet) will raise AttributeError like any other
-#    uninitialized attribute.
+#    Attempting to read a write-once attribute that hasn't been set yet
+#    will raise AttributeError like any other uninitialized attribute.
+#
+#  - READONLY must be a set (ValueError, when the class is created,
+#    otherwise).
 #
 #  - Attribute 'pid' is hardwired read-only regardless of whether it is
 #    in READONLY (explicitly as 'pid' or implicitly via '*').
@@ -701,6 +946,17 @@ class PIDModifier:
         """Default (no-op) handler for unhandled event types"""
         pass
 
+    # A modifier whose handler for some event type is (sometimes) known
+    # to have nothing to do can say so here, and while it does it will
+    # not be called for those events at all (and if no other modifier
+    # handles them, the events are not even generated). Any time the
+    # answer changes, the modifier MUST call handlers_changed() on the
+    # PIDPlus. The handler itself must still be correct if it is called
+    # anyway; this is purely an optimization.
+    def idle_for(self, eventclass):
+        """Return True if eventclass events can (currently) be skipped."""
+        return False
+
 
 class PIDHistory(PIDModifier):
     """Look-back record, event counts."""
@@ -779,12 +1035,11 @@ class PIDHistory(PIDModifier):
 
         # implementation note: event=None is handled implicitly because
         # it is known that None will never be *in* .history
-        gen = itertools.dropwhile(lambda x: x != event, self.history)
         try:
-            _ = next(gen)                  # skip the event itself
-        except StopIteration:
-            gen = self.history             # event wasn't in there at all
-        yield from gen
+            nth = self.history.index(event) + 1    # skip the event itself
+        except ValueError:
+            nth = 0                        # event wasn't in there at all
+        yield from itertools.islice(self.history, nth, None)
 
     def __repr__(self):
         s = f"{self.__class__.__name__}("
@@ -797,6 +1052,72 @@ class PIDHistory(PIDModifier):
         return s + ")"
 
 
+class PIDArrayRecorder(PIDModifier):
+    """Record e/p/i/d/u (etc) of every calculation into numpy arrays."""
+
+    # This is a stateful modifier and cannot be shared among PIDs
+    PH_attached = PIDModifier.attached_once_check
+
+    # 't' is elapsed time (the running sum of dt); 'sp' is pid.setpoint
+    FIELDS = ('t', 'e', 'p', 'i', 'd', 'u', 'sp', 'pv', 'dt')
+
+    def __init__(self, n=PIDHistory.DEFAULTSIZE, *args, **kwargs):
+        """Records each calculation, one column per pid() call.
+
+        'n' is the initial capacity; the storage doubles as needed, so
+        giving the expected number of calls avoids any reallocation.
+
+        Each of the FIELDS is then available as an attribute (e.g., .u)
+        that is a numpy array of all the recorded values, oldest first.
+        Requires numpy.
+        """
+        if np is None:
+            raise ImportError("PIDArrayRecorder requires numpy")
+        if n < 1:
+            raise ValueError(f"capacity (={n}) must be at least 1")
+
+        super().__init__(*args, **kwargs)
+        self._data = np.empty((len(self.FIELDS), n))
+        self.clear()
+
+    def clear(self):
+        """Discard all recorded values (capacity is retained)."""
+        self._k = 0
+        self._t = 0.0
+
+    def PH_calculate_u(self, event):
+        # Each field is a contiguous row of _data; each call is a column.
+        k = self._k
+        if k == self._data.shape[1]:
+            self._data = np.concatenate(
+                (self._data, np.empty_like(self._data)), axis=1)
+        dt = event.dt
+        pid = event.pid
+        self._t += dt
+        self._data[:, k] = (self._t, event.e, event.p, event.i, event.d,
+                            event.u, pid.setpoint, pid.pv, dt)
+        self._k = k + 1
+
+    # .t, .e, etc are views of the recorded portion of each row
+    def __getattr__(self, name):
+        try:
+            row = self.FIELDS.index(name)
+        except ValueError:
+            raise AttributeError(name) from None
+        return self._data[row, :self._k]
+
+    def __len__(self):
+        return self._k
+
+    def as_dataframe(self):
+        """Return the recording as a pandas DataFrame (requires pandas)."""
+        import pandas
+        return pandas.DataFrame({f: getattr(self, f) for f in self.FIELDS})
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._data.shape[1]})"
+
+
 class EventPrint(PIDModifier):
     """Event printer, helpful for debug and learning."""
     def __init__(self, *args, prefix="", **kwargs):
@@ -830,9 +1151,12 @@ class I_Windup(PIDModifier):
 
         # see if w is a tuple (of length 2)
         try:
-            a, b = sorted(w)
+            a, b = w
         except TypeError:
             a, b = -abs(w), abs(w)    # prevent negative shenanigans
+        else:
+            if b < a:
+                a, b = b, a
 
         # make sure a and b are both numeric
         try:
@@ -846,8 +1170,16 @@ class I_Windup(PIDModifier):
         self.w1 = b
 
     def PH_modify_terms(self, event):
-        clamped = max(self.w0, min(event.pid.integration, self.w1))
-        event.i = event.pid.integration = clamped
+        # Explicit compares rather than max(w0, min(v, w1)), because this
+        # runs every pid() and the (common) unclamped case is then just
+        # two compares with no builtin calls.
+        pid = event.pid
+        v = pid.integration
+        if v > self.w1:
+            v = self.w1
+        elif v < self.w0:
+            v = self.w0
+        event.i = pid.integration = v
 
     def __repr__(self):
         s = f"{self.__class__.__name__}("
@@ -858,6 +1190,52 @@ class I_Windup(PIDModifier):
         return s + ")"
 
 
+# Back-calculation anti-windup. Rather than hard-limiting the integration
+# term (as I_Windup does), this limits the OUTPUT ('u') to [u_min, u_max]
+# and, whenever the output had to be limited, "bleeds off" integration in
+# proportion to how far the unlimited output exceeded the limit:
+#
+#      integration += rho * (saturated_u - u) * dt
+#
+# The correction is applied to the integration that will be used in the
+# NEXT pid() calculation; the current 'u' is simply limited. Larger rho
+# values unwind the integration more aggressively. See, e.g., Astrom &
+# Hagglund on "tracking anti-windup"; rho is 1/Tt (tracking time constant)
+# expressed in terms of the unweighted integration term.
+#
+class I_BackCalc(PIDModifier):
+    """Limit u to [u_min, u_max] with back-calculation anti-windup."""
+
+    def __init__(self, rho, u_min, u_max, *args, **kwargs):
+        """Output will be held to [u_min, u_max] range; rho is the
+        back-calculation (tracking) gain applied to the integration.
+        """
+        if rho < 0:
+            raise ValueError(f"rho (={rho}) must not be negative")
+        if u_min > u_max:
+            raise ValueError(f"u_min (={u_min}) > u_max (={u_max})")
+
+        super().__init__(*args, **kwargs)
+        self.rho = rho
+        self.u_min = u_min
+        self.u_max = u_max
+
+    def PH_calculate_u(self, event):
+        u = event.u
+        if u > self.u_max:
+            sat = self.u_max
+        elif u < self.u_min:
+            sat = self.u_min
+        else:
+            return
+        event.pid.integration += self.rho * (sat - u) * event.dt
+        event.u = sat
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}("
+                f"{self.rho}, {self.u_min}, {self.u_max})")
+
+
 # This modifier allows freezing the integration term for a period of time
 # based on external logic. As described, for example, in the wikipedia PID
 # article section on algorithm modifications:
@@ -938,11 +1316,26 @@ class I_SetpointReset(PIDModifier):
         self.pause_remaining = 0
 
     def PH_initial_conditions(self, event):
-        self.pause_remaining = 0
+        self._pause(event.pid, 0)
 
     def PH_setpoint_change(self, event):
         event.pid.integration = 0
-        self.pause_remaining = self.integration_pause
+        self._pause(event.pid, self.integration_pause)
+
+    def _pause(self, pid, secs):
+        """Start (or, with secs=0, end) pausing the integration."""
+        # Going between pausing/not pausing changes idle_for()
+        was_pausing = self.pause_remaining > 0
+        self.pause_remaining = secs
+        if was_pausing != (secs > 0):
+            pid.handlers_changed()
+
+    def idle_for(self, eventclass):
+        # There are no BaseTerms to do while not pausing, unless a
+        # subclass has its own PH_base_terms
+        return (eventclass is PIDHookBaseTerms and
+                self.pause_remaining <= 0 and
+                type(self).PH_base_terms is I_SetpointReset.PH_base_terms)
 
     def PH_base_terms(self, event):
         # When triggered (by a setpoint change):
@@ -960,6 +1353,9 @@ class I_SetpointReset(PIDModifier):
             # (correctly) prevents accumulation in pid.integration
             event.i = 0
 
+            if self.pause_remaining == 0:
+                event.pid.handlers_changed()     # now idle_for BaseTerms
+
 
 class SetpointRamp(PIDModifier):
     """Add setpoint ramping (smoothing out setpoint changes) to a PID"""
@@ -993,19 +1389,52 @@ class SetpointRamp(PIDModifier):
         self._hiddenramp = hiddenramp
         self._ramptime = secs
         self._threshold = threshold
+        self._bypassing = False    # True while setting the real setpoint
+        self._countdown = 0        # time remaining in ramp (none, yet)
         self._noramp(setpoint=0)
 
     def _noramp(self, /, *, setpoint):
         """Returns state to 'no ramp in progress'."""
         self._target_sp = setpoint           # ending setpoint
-        self._countdown = 0                  # time remaining in ramp
+        self._stopramp()
         self._set_real_setpoint(setpoint)    # observed setpoint
 
     def _ramped(self):
         """Return the current (ramped) setpoint based on _countdown"""
-        pcttime = (self._ramptime - self._countdown) / self._ramptime
-        totaldelta = (self._target_sp - self._start_sp)
-        return self._clamper(self._start_sp + (totaldelta * pcttime))
+        # _slope is precomputed whenever a ramp (re)starts, so each tick
+        # is one multiply instead of a divide; the clamp (toward the target)
+        # guards against floating fuzz overshooting the target.
+        sp = self._target_sp - (self._slope * self._countdown)
+        if self._rampingup:
+            return sp if sp < self._target_sp else self._target_sp
+        return sp if sp > self._target_sp else self._target_sp
+
+    def _startramp(self, start_sp, secs):
+        """Begin ramping from start_sp to _target_sp over secs (nonzero)."""
+        was_idle = self._countdown == 0
+        self._countdown = secs
+        self._slope = (self._target_sp - start_sp) / secs
+        self._rampingup = start_sp < self._target_sp
+        if was_idle:
+            self._idle_changed()
+
+    def _stopramp(self):
+        """End any ramp in progress (does not touch the setpoint)."""
+        if self._countdown != 0:
+            self._countdown = 0
+            self._idle_changed()
+
+    # No ramp in progress is by far the common case, and then there is
+    # nothing for PH_base_terms to do; so (unless a subclass has its own
+    # PH_base_terms) BaseTerms events are skipped entirely.
+    def idle_for(self, eventclass):
+        return (eventclass is PIDHookBaseTerms and
+                self._countdown == 0 and
+                type(self).PH_base_terms is SetpointRamp.PH_base_terms)
+
+    def _idle_changed(self):
+        if self.pid is not None:
+            self.pid.handlers_changed()
 
     # property because if it changes the ramping may have to be adjusted
     @property
@@ -1019,8 +1448,6 @@ class SetpointRamp(PIDModifier):
             # to mean: continue whatever ramping remains, with that remaining
             # ramp spread out over the new secs
 
-            self._start_sp = self._ramped()   # i.e., ramp starts HERE ...
-
             # but if it's been set to zero, just go there RIGHT NOW
             # NOTE: being able to set secs to zero midramp requires knowing
             #       the .pid here (to... set the setpoint). Obviously, there
@@ -1030,8 +1457,11 @@ class SetpointRamp(PIDModifier):
             #       even when it is available more naturally as event.pid)
             if v == 0:
                 self._set_real_setpoint(self._target_sp)
+                self._stopramp()
+            else:
+                self._startramp(self._ramped(), v)  # i.e., ramp starts HERE
 
-        self._ramptime = self._countdown = v
+        self._ramptime = v
 
     # If the setpoint gets changed via an initial_conditions method
     # then it happens immediately (no ramping).
@@ -1042,21 +1472,21 @@ class SetpointRamp(PIDModifier):
 
     def PH_setpoint_change(self, event):
         # NO-OP conditions:
+        #   this is the ramp itself setting the (real) setpoint,
         #   ramp parameter zero,
         #   no change in setpoint
-        if self._ramptime == 0 or event.sp_to == self._target_sp:
+        sp_to = event.sp_to
+        if (self._bypassing or
+                self._ramptime == 0 or sp_to == self._target_sp):
             return
 
         # if the change is within threshold, set immediate, cancel ramping
-        if abs(event.sp_to - self.pid.setpoint) < self._threshold:
-            self._noramp(setpoint=event.sp_to)
+        if abs(sp_to - self.pid.setpoint) < self._threshold:
+            self._noramp(setpoint=sp_to)
             return
 
-        self._start_sp = event.sp_from
-        self._target_sp = event.sp_to
-        self._countdown = self._ramptime
-        clampf = min if self._start_sp < self._target_sp else max
-        self._clamper = lambda x: clampf(x, self._target_sp)
+        self._target_sp = sp_to
+        self._startramp(event.sp_from, self._ramptime)
         if not self._hiddenramp:
             event.sp = self._ramped()     # make it ramp
 
@@ -1073,18 +1503,20 @@ class SetpointRamp(PIDModifier):
         if self._hiddenramp:
             return
 
-        # This try/finally block is necessary because there could be OTHER
-        # modifiers with PH_setpoint_change handlers, so anything in terms
-        # of exceptions is possible. Of course, things are probably woefully
-        # awry if that happens, but, try to maintain sanity here anyway.
+        # _bypassing makes PH_setpoint_change ignore this (self-inflicted)
+        # setpoint change. The try/finally is necessary because there could
+        # be OTHER modifiers with PH_setpoint_change handlers, so anything in
+        # terms of exceptions is possible. Of course, things are probably
+        # woefully awry if that happens, but, try to maintain sanity anyway.
+        self._bypassing = True
         try:
-            saved_ramp, self._ramptime = self._ramptime, 0
             self.pid.setpoint = v
         finally:
-            self._ramptime = saved_ramp
+            self._bypassing = False
 
     def PH_base_terms(self, event):
         # optimize the common case of no ramping in progress
+        # (though normally this isn't even called then; see idle_for)
         if self._countdown == 0:
             return
 
@@ -1095,16 +1527,17 @@ class SetpointRamp(PIDModifier):
         # the other way (countdown slightly larger than correct) then this
         # tick gets the setpoint to 99.x% of the final value and there will
         # be one extra tick for the rest. No one cares; this is good enough.
-        if self._countdown <= event.dt:
+        dt = event.dt
+        if self._countdown <= dt:
             # last tick; slam to _target_sp in case of any floating fuzz.
             self._set_real_setpoint(self._target_sp)
-            self._countdown = 0
+            self._stopramp()
         else:
             # Still ramping ... This is the normal ramping case but could
             # potentially also be the "one extra" tick mentioned above
-            # in which case pcttime will be very very close to 1.00 and
+            # in which case _ramped() will be very very close to target and
             # the next tick after this will trigger the above branch
-            self._countdown -= event.dt
+            self._countdown -= dt
 
             # when the ramping setpoint is being hidden, this needs to
             # supply an alternate 'e' making use of the ramping setpoint
@@ -1200,20 +1633,23 @@ class BangBang(PIDModifier):
         self.dead_value = dead_value
 
     def PH_calculate_u(self, event):
-        if self.off_threshold is None:    # on_thr.. must not be None
-            if event.u >= self.on_threshold:
+        u = event.u
+        on_threshold = self.on_threshold
+        off_threshold = self.off_threshold
+        if off_threshold is None:           # on_thr.. must not be None
+            if u >= on_threshold:
                 val = self.on_value
             else:
                 val = self.off_value
-        elif self.on_threshold is None:  # off_thr.. must not be None
-            if event.u > self.off_threshold:
+        elif on_threshold is None:          # off_thr.. must not be None
+            if u > off_threshold:
                 val = self.on_value
             else:
                 val = self.off_value
         else:
-            if event.u >= self.on_threshold:
+            if u >= on_threshold:
                 val = self.on_value
-            elif event.u <= self.off_threshold:
+            elif u <= off_threshold:
                 val = self.off_value
             else:
                 val = self.dead_value     # which may be None
@@ -1258,20 +1694,57 @@ class D_DeltaE(PIDModifier):
             self.kickticks = 1
 
     def PH_modify_terms(self, event):
-        if self.previous_e is None:     # special case for very first call
-            event.d = 0
+        e = event.e
+        previous_e = self.previous_e
+        if previous_e is None:          # special case for very first call
+            d = 0
         elif self.kickticks == 0:
-            event.d = (event.e - self.previous_e) / event.dt
+            d = (e - previous_e) / event.dt
         else:
             self.kickticks -= 1
-            event.d = self.previous_d
-        self.previous_e = event.e
-        self.previous_d = event.d
+            d = self.previous_d
+        event.d = self.previous_d = d
+        self.previous_e = e
+
+    @staticmethod
+    def batch_d(es, dts, kicks=None):
+        """Return (numpy array) the D values for a whole run of e values.
+
+        This is the vectorized equivalent of what a freshly initialized
+        D_DeltaE computes, one pid() at a time, for e values 'es' with
+        intervals 'dts' (a sequence, or a single value for all). If given,
+        'kicks' is a sequence of booleans: True for each tick where kick
+        filtering repeats the previous D (the tick after a setpoint change).
+        Useful for offline analysis; requires numpy.
+        """
+        if np is None:
+            raise ImportError("batch_d() requires numpy")
+
+        es = np.asarray(es, dtype=float)
+        dts = np.broadcast_to(np.asarray(dts, dtype=float), es.shape)
+        d = np.zeros_like(es)             # the FIRST time there is no D
+        d[1:] = (es[1:] - es[:-1]) / dts[1:]
+        if kicks is not None:
+            # each kick tick repeats the D of the most recent non-kick tick
+            # (tick 0 counts as non-kick: it's always 0, as above). A kick
+            # on tick 0 isn't consumed there (there's no previous e), so
+            # it carries forward to tick 1.
+            kicks = np.array(kicks, dtype=bool)
+            if len(kicks) > 1 and kicks[0]:
+                kicks[1] = True
+            nth = np.arange(len(es))
+            nth[kicks] = 0
+            d = d[np.maximum.accumulate(nth)]
+        return d
 
 
 if __name__ == "__main__":
     import unittest
     import math
+    import pickle
+    import weakref
+    from fractions import Fraction
+    from collections import ChainMap
 
     class TestMethods(unittest.TestCase):
         def test_simple(self):
@@ -1299,6 +1772,33 @@ if __name__ == "__main__":
                         p = klass(**pidargs)
                         _onetest(p, **testargs)
 
+        def test_values_as_given(self):
+            # gains, dt, and pv are kept as given (not coerced to float),
+            # so that repr() shows them that way and exact types work
+            self.assertEqual(repr(PID(Kp=10)), "PID(Kp=10)")
+            self.assertEqual(repr(PIDPlus(Kp=10, Kd=2.5)),
+                             "PIDPlus(Kp=10, Kd=2.5)")
+            z = PID(Kp=Fraction(1, 3), Ki=1, dt=Fraction(1, 10))
+            z.initial_conditions(pv=Fraction(1, 4), setpoint=1)
+            self.assertEqual(z.pid(Fraction(1, 2)), Fraction(13, 60))
+            self.assertIsInstance(z.integration, Fraction)
+
+        def test_nonfinite_pv(self):
+            # the inline (PID) and per-term (PIDPlus w/handlers) D term
+            # calculations must agree, even for non-finite pv values
+            z0 = PID(Kd=1)
+            z1 = PIDPlus(Kd=1, modifiers=DTZero())
+            for pv in (1, math.inf, math.inf, 2):
+                z0.pid(pv, dt=1)
+                z1.pid(pv, dt=1)
+                with self.subTest(pv=pv):
+                    self.assertEqual(str(z0.last_pid), str(z1.last_pid))
+
+            # specifically: inf followed by inf is not a zero D
+            z1.pid(math.inf, dt=1)
+            z1.pid(math.inf, dt=1)
+            self.assertTrue(math.isnan(z1.last_pid[2]))
+
         def test_KTT(self):
             # Test the suggestions in the README file on how to create a PID
             # that takes Ti/Td argument forms. This interface adapter class
@@ -1360,6 +1860,99 @@ if __name__ == "__main__":
                 expected = (errs[-1] * Kp) + ((errs[-1] - errs[-2]) * Kd)
                 self.assertEqual(u, expected)
 
+        @unittest.skipIf(np is None, "requires numpy")
+        def test_pid_many(self):
+            # pid_many should exactly match one-at-a-time pid() calls,
+            # both in the returned u values and in the resulting state
+            pvs = [3, 2.5, 2.5, 1, -0.25, 0, 0, 7, 6.125, 6]
+            dts = [0.1, 0.1, 0.2, 0.05, 0.1, 0.3, 0.1, 0.1, 0.01, 1]
+            for klass in (PID, PIDPlus):
+                for dtarg in (dts, 0.1, None):
+                    with self.subTest(klass=klass, dtarg=dtarg):
+                        z1 = klass(Kp=1.5, Ki=0.75, Kd=0.3, dt=0.25)
+                        z2 = klass(Kp=1.5, Ki=0.75, Kd=0.3, dt=0.25)
+                        for z in (z1, z2):
+                            z.initial_conditions(pv=2, setpoint=4)
+                            z.integration = 0.1
+
+                        if dtarg is None:
+                            loopdts = [None] * len(pvs)
+                        elif dtarg is dts:
+                            loopdts = dts
+                        else:
+                            loopdts = [dtarg] * len(pvs)
+                        us = [z1.pid(pv, dt) for pv, dt in zip(pvs, loopdts)]
+                        self.assertEqual(list(z2.pid_many(pvs, dtarg)), us)
+                        for a in ('pv', 'dt', 'previous_pv',
+                                  'integration', 'last_pid'):
+                            self.assertEqual(getattr(z1, a), getattr(z2, a))
+
+            # with modifiers it just runs the modifiers each step
+            z1 = PIDPlus(Ki=1, modifiers=I_Windup(0.5))
+            z2 = PIDPlus(Ki=1, modifiers=I_Windup(0.5))
+            us = [z1.pid(pv, 0.1) for pv in pvs]
+            self.assertEqual(list(z2.pid_many(pvs, 0.1)), us)
+
+            # subclass overrides of _calculate or a term are honored
+            class C(PID):
+                def _calculate(self):
+                    return super()._calculate() + 1
+
+            class U(PID):
+                def _u(self, p, i, d):
+                    return 42
+
+            class P(PID):
+                def pid(self, pv, dt=None):
+                    return super().pid(pv, dt) * 2
+
+            for klass in (C, U, P):
+                with self.subTest(klass=klass):
+                    z1 = klass(Kp=1, Ki=1)
+                    z2 = klass(Kp=1, Ki=1)
+                    us = [z1.pid(pv, 0.1) for pv in pvs]
+                    self.assertEqual(list(z2.pid_many(pvs, 0.1)), us)
+                    for a in ('pv', 'dt', 'previous_pv', 'integration'):
+                        self.assertIs(type(getattr(z2, a)), float)
+
+            # a scalar is a sequence of one
+            z1 = PID(Kp=2, Ki=1)
+            z2 = PID(Kp=2, Ki=1)
+            self.assertEqual(list(z2.pid_many(3, 0.1)), [z1.pid(3, 0.1)])
+
+            z = PID(Kd=1)
+            with self.assertRaises(ValueError):
+                z.pid_many(pvs, 0)
+            with self.assertRaises(ValueError):
+                z.pid_many([[1, 2], [3, 4]], 0.1)
+
+        @unittest.skipIf(np is None, "requires numpy")
+        def test_pidarray(self):
+            gains = [dict(Kp=1.5, Ki=0.75, Kd=0.3),
+                     dict(Kp=2, Ki=0, Kd=0.1),
+                     dict(Kp=0.5, Ki=2.25, Kd=0)]
+            zs = [PID(**g) for g in gains]
+            za = PIDArray(len(gains), **{k: [g[k] for g in gains]
+                                         for k in ('Kp', 'Ki', 'Kd')})
+            for z, sp in zip(zs, (1, 2, 3)):
+                z.initial_conditions(pv=0.5, setpoint=sp)
+            za.initial_conditions(pv=0.5, setpoint=(1, 2, 3))
+
+            for pvs, dt in (((0, 1, 2), 0.25),
+                            ((0.25, 1.5, 2), (0.25, 0.5, 0.125)),
+                            ((0.5, 1.75, 3.5), None)):
+                us = za.pid(pvs, dt)
+                for nth, (z, pv) in enumerate(zip(zs, pvs)):
+                    with self.subTest(nth=nth, pvs=pvs):
+                        self.assertEqual(us[nth], z.pid(pv, za.dt[nth]))
+                        zc = za.to_pid(nth)
+                        self.assertEqual(vars(zc), vars(z))
+                        for a in ('Kp', 'Ki', 'Kd', 'dt'):
+                            self.assertIs(type(getattr(zc, a)), float)
+
+            with self.assertRaises(ValueError):
+                za.pid((1, 2, 3), dt=(0.1, 0, 0.1))
+
         def test_Dkick(self):
             pv0, u0 = 5, 0              # startup case
             pv1, u1 = 6, -1             # u1 = -1 bcs pv incr'd 1
@@ -1512,15 +2105,27 @@ if __name__ == "__main__":
                 self.assertEqual(u1, setpoint)
                 u2 = z.pid(0, dt=1)
                 self.assertEqual(u2, u1 + setpoint)
+                # not pausing, so no BaseTerms events needed
+                self.assertFalse(z._is_handled(PIDHookBaseTerms))
+
                 # but now changing the setpoint should cause a reset
                 z.setpoint = 2*setpoint
                 self.assertEqual(z.integration, 0)
+                self.assertEqual(z._is_handled(PIDHookBaseTerms), secs > 0)
                 for tick in range(secs):
                     with self.subTest(tick=tick, secs=secs):
                         self.assertEqual(z.pid(0, dt=1), 0)
 
                 # and this last one should be > 0 as now past the secs
                 self.assertTrue(z.pid(0, dt=1) > 0)
+                self.assertFalse(z._is_handled(PIDHookBaseTerms))
+
+            # initial_conditions cancels a pause in progress
+            z.setpoint = setpoint
+            self.assertTrue(z._is_handled(PIDHookBaseTerms))
+            z.initial_conditions(pv=0)
+            self.assertFalse(z._is_handled(PIDHookBaseTerms))
+            self.assertTrue(z.pid(0, dt=1) > 0)
 
         def test_setpointramp_trivia(self):
             # a few very directed simple tests at some prior bugs
@@ -1540,6 +2145,14 @@ if __name__ == "__main__":
                     expecting = 0
             self.assertEqual(p.setpoint, expecting)
 
+            # changing secs when no ramp is in progress must not start one
+            ramper = SetpointRamp(2)
+            p = PIDPlus(Kp=1, modifiers=ramper)
+            p.initial_conditions(pv=0, setpoint=3)
+            ramper.secs = 5
+            self.assertEqual(p.pid(0, dt=1), 3)
+            self.assertEqual(p.setpoint, 3)
+
         def test_spramp1(self):
             ramptime = 17       # just to be ornery with division/fuzz
             setpoint = 5
@@ -1745,6 +2358,83 @@ if __name__ == "__main__":
             else:
                 raise ValueError(f"never got down to {wlo}")
 
+        def test_backcalc(self):
+            # Saturate the output for a long time then reverse the error.
+            # With back-calculation the output should come off the limit
+            # much sooner than with a plain (unlimited) integration.
+            u_max = 0.5
+            dt = 0.1
+            ticks = {}
+            for rho in (0, 5):
+                bc = I_BackCalc(rho, -u_max, u_max)
+                z = PIDPlus(Kp=0.25, Ki=1, modifiers=bc)
+                z.initial_conditions(pv=0, setpoint=1)
+                for i in range(200):
+                    u = z.pid(0, dt=dt)
+                    self.assertTrue(-u_max <= u <= u_max)
+                self.assertEqual(u, u_max)
+                if rho > 0:
+                    # integration should have settled near the value that
+                    # makes (Kp*e + Ki*integration) just exceed u_max
+                    self.assertTrue(z.integration < 2 * u_max)
+                for ticks[rho] in itertools.count():
+                    u = z.pid(2, dt=dt)
+                    self.assertTrue(-u_max <= u <= u_max)
+                    if u < u_max:
+                        break
+            self.assertTrue(ticks[5] < ticks[0] / 10)
+
+            with self.assertRaises(ValueError):
+                I_BackCalc(1, 2, 1)
+            with self.assertRaises(ValueError):
+                I_BackCalc(-1, 1, 2)
+
+        @unittest.skipIf(np is None, "requires numpy")
+        def test_deltae_batch(self):
+            # the second run has a setpoint change before the first pid()
+            for ticks in (((0, 1), (0.5, 1), (0.75, 3), (1, 3), (2, 0),
+                           (2.5, 1), (1.5, 1), (1, 1), (0.5, 1)),
+                          ((0, 2), (0.5, 2), (1, 2), (1.5, 2))):
+                z = PIDPlus(Kd=1, modifiers=D_DeltaE(kickfilter=True))
+                z.initial_conditions(pv=0, setpoint=1)
+                es = []
+                ds = []
+                kicks = []
+                for pv, sp in ticks:
+                    kicks.append(sp != z.setpoint)
+                    z.setpoint = sp
+                    z.pid(pv, dt=0.25)
+                    es.append(z.setpoint - pv)
+                    ds.append(z.last_pid[2])
+
+                with self.subTest(ticks=ticks):
+                    self.assertEqual(list(D_DeltaE.batch_d(es, 0.25, kicks)),
+                                     ds)
+            self.assertEqual(list(D_DeltaE.batch_d(es, [0.25] * len(es))),
+                             [0] + [(b - a) / 0.25
+                                    for a, b in zip(es, es[1:])])
+
+        def test_modifier_attributes(self):
+            # built-in modifiers are ordinary objects: ad-hoc attributes,
+            # weak references, and multiple inheritance all work
+            for m in (PIDHistory(), EventPrint(), I_Windup(1),
+                      I_BackCalc(1, 0, 1), I_Freeze(), I_SetpointReset(1),
+                      SetpointRamp(1), DeadBand(1), DTZero(), BangBang(),
+                      D_DeltaE()):
+                with self.subTest(m=m):
+                    m.foo = 17
+                    self.assertEqual(m.foo, 17)
+                    self.assertIs(weakref.ref(m)(), m)
+
+            class C(I_Freeze, DeadBand):
+                def __init__(self):
+                    super().__init__(1)      # DeadBand(biggerthan=1)
+
+            c = C()
+            z = PIDPlus(Kp=1, modifiers=c)
+            z.pid(0, dt=1)
+            self.assertFalse(c.frozen)
+
         def test_readonly(self):
             class Foo(PIDModifier):
                 def PH_modify_terms(self, event):
@@ -1781,6 +2471,58 @@ if __name__ == "__main__":
 
             self.assertEqual(f.foo, 'fooby')
 
+        def test_handlername(self):
+            self.assertEqual(PIDHookSetpointChange.handlername(),
+                             'PH_setpoint_change')
+            self.assertEqual(PIDHookHookStopped.handlername(),
+                             'PH_hook_stopped')
+            self.assertEqual(_PIDHookEvent._autoname('PIDHookFooBar'),
+                             'PH_foo_bar')
+            self.assertIsNone(_PIDHookEvent._autoname('FooBar'))
+
+            # not autonamed, and no explicit NOTIFYHANDLER
+            class Unnamed(_PIDHookEvent):
+                pass
+
+            with self.assertRaises(AttributeError):
+                Unnamed.handlername()
+
+        def test_event_deepcopy_pickle(self):
+            e = PIDHookSetpointChange(pid=None, sp_from=1, sp_to=2, sp=2)
+            for e2 in (copy.deepcopy(e), pickle.loads(pickle.dumps(e))):
+                self.assertEqual(e2.attrs(), e.attrs())
+                with self.assertRaises(TypeError):
+                    e2.sp_to = 3        # still read-only
+
+            # ... which also makes a PIDPlus with a PIDHistory copyable
+            z = PIDPlus(Kp=1, modifiers=[PIDHistory(), SetpointRamp(2)])
+            z.setpoint = 3
+            z.pid(0, dt=1)
+            copies = (copy.deepcopy(z), pickle.loads(pickle.dumps(z)))
+            u = z.pid(0, dt=1)
+            for z2 in copies:
+                self.assertEqual(z2.pid(0, dt=1), u)
+                self.assertEqual(len(z2.modifiers[0].history),
+                                 len(z.modifiers[0].history))
+
+            # a subclass can set attributes before super().__init__()
+            class EarlyBird(_PIDHookEvent):
+                READONLY = {'foo'}
+
+                def __init__(self, **kwargs):
+                    self.worm = True
+                    super().__init__(**kwargs)
+
+            eb = EarlyBird()
+            self.assertTrue(eb.worm)
+
+            # deleting a never-written write-once attribute: AttributeError
+            with self.assertRaises(AttributeError):
+                del eb.foo
+            eb.foo = 1
+            with self.assertRaises(TypeError):
+                del eb.foo
+
         def test_multi_readonly(self):
             # tests that the property magic for read-only attrs
             # works properly in the face of multiple hook objects
@@ -1846,6 +2588,135 @@ if __name__ == "__main__":
             z = PIDPlus(modifiers=FooMod())
             z.pid(1, dt=0.01)         # that this doesn't bomb is the test
 
+        def test_unhandled_calc_events(self):
+            # calc events that no modifier handles are not generated at all,
+            # but the ones that are handled must still see the right values
+            class OnlyU(PIDModifier):
+                def __init__(self, *args, **kwargs):
+                    super().__init__(*args, **kwargs)
+                    self.seen = []
+
+                def PH_calculate_u(self, event):
+                    self.seen.append(event)
+
+            m = OnlyU()
+            h = PIDHistory()
+            z0 = PID(Kp=1.5, Ki=0.5, Kd=0.25)
+            z1 = PIDPlus(Kp=1.5, Ki=0.5, Kd=0.25, modifiers=[m, PIDModifier()])
+            z2 = PIDPlus(Kp=1.5, Ki=0.5, Kd=0.25, modifiers=h)
+            for pv in (1, 2, 2.5, 0.75):
+                u0 = z0.pid(pv, dt=0.1)
+                self.assertEqual(z1.pid(pv, dt=0.1), u0)
+                self.assertEqual(z2.pid(pv, dt=0.1), u0)
+                self.assertEqual(m.seen[-1].u, u0)
+                self.assertEqual(m.seen[-1].dt, 0.1)
+                self.assertEqual(
+                    (m.seen[-1].p, m.seen[-1].i, m.seen[-1].d), z0.last_pid)
+                self.assertEqual(z1.last_pid, z0.last_pid)
+            self.assertEqual(len(m.seen), 4)
+
+            # PIDHistory handles everything (via PH_default) so it sees all
+            for evc in (PIDHookBaseTerms,
+                        PIDHookModifyTerms,
+                        PIDHookCalculateU):
+                self.assertEqual(h.eventcounts[evc.handlername()], 4)
+
+            # no calc events handled at all, and no setpoint listener either
+            z3 = PIDPlus(Kp=1.5, Ki=0.5, Kd=0.25, modifiers=PIDModifier())
+            for z in (z0, z3):
+                z.initial_conditions(pv=0, setpoint=1)
+                z.setpoint = 2
+            for pv in (1, 2, 2.5, 0.75):
+                self.assertEqual(z3.pid(pv, dt=0.1), z0.pid(pv, dt=0.1))
+                self.assertEqual(z3.last_pid, z0.last_pid)
+            self.assertEqual(z3.setpoint, 2)
+
+        def test_idle_ramp(self):
+            # SetpointRamp only generates BaseTerms events while ramping
+            ramp = SetpointRamp(1)
+            z = PIDPlus(Kp=1, modifiers=ramp)
+            self.assertFalse(z._is_handled(PIDHookBaseTerms))
+            z.setpoint = 1
+            self.assertTrue(z._is_handled(PIDHookBaseTerms))
+            for i in range(20):
+                z.pid(0, dt=0.1)
+            self.assertEqual(z.setpoint, 1)
+            self.assertFalse(z._is_handled(PIDHookBaseTerms))
+
+            # other ways a ramp can end
+            z.setpoint = 2
+            self.assertTrue(z._is_handled(PIDHookBaseTerms))
+            ramp.secs = 0
+            self.assertEqual(z.setpoint, 2)
+            self.assertFalse(z._is_handled(PIDHookBaseTerms))
+
+            ramp.secs = 1
+            z.setpoint = 3
+            self.assertTrue(z._is_handled(PIDHookBaseTerms))
+            z.initial_conditions(setpoint=5)
+            self.assertEqual(z.setpoint, 5)
+            self.assertFalse(z._is_handled(PIDHookBaseTerms))
+
+            # changing secs while idle must not start a (phantom) ramp,
+            # but the new secs applies to the next setpoint change
+            ramp.secs = 2
+            self.assertFalse(z._is_handled(PIDHookBaseTerms))
+            z.pid(0, dt=1)
+            self.assertEqual(z.setpoint, 5)
+            z.setpoint = 7
+            z.pid(0, dt=1)
+            self.assertEqual(z.setpoint, 6)
+            self.assertTrue(z._is_handled(PIDHookBaseTerms))
+
+        def test_term_overrides(self):
+            # overridden term methods must be used whether or not any
+            # modifier happens to handle the calc events
+            class P(PIDPlus):
+                def _u(self, p, i, d):
+                    return 42
+
+            for mods in (None, PIDModifier(), DTZero()):
+                with self.subTest(mods=mods):
+                    z = P(Kp=1, dt=0.1, modifiers=mods)
+                    self.assertEqual(z.pid(1), 42)
+
+            # same for a plain PID subclass, and for a subclass-of-subclass
+            class Q(PID):
+                def _integral(self, e):
+                    return 17
+
+            class R(Q):
+                pass
+
+            for cls in (Q, R):
+                with self.subTest(cls=cls):
+                    z = cls(Ki=1, dt=0.1)
+                    self.assertEqual(z.pid(1), 17)
+                    self.assertEqual(z.last_pid, (-1, 17, -10))
+            self.assertTrue(PIDPlus._inline_terms)
+
+        def test_idle_subclass(self):
+            # a subclass with its own PH_base_terms always gets called,
+            # even when the base class would be idle_for BaseTerms
+            for base in (SetpointRamp, I_SetpointReset):
+                class Counted(base):
+                    ticks = 0
+
+                    def PH_base_terms(self, event):
+                        self.ticks += 1
+                        super().PH_base_terms(event)
+
+                m = Counted(1)
+                z = PIDPlus(Kp=1, Ki=1, modifiers=m)
+                for i in range(5):
+                    z.pid(0, dt=0.5)
+                z.setpoint = 1
+                for i in range(5):
+                    z.pid(0, dt=0.5)
+                with self.subTest(base=base):
+                    self.assertEqual(m.ticks, 10)
+                    self.assertEqual(z.setpoint, 1)
+
         def test_handler_exceptions_1(self):
             # a small test demonstrating PIDHookFailure handling but
             # also demonstrating what happens if a PIDHookFailure handler
@@ -2111,6 +2982,33 @@ if __name__ == "__main__":
             with self.assertRaises(TypeError):
                 e1.pid = None
 
+        @unittest.skipIf(np is None, "requires numpy")
+        def test_arrayrecorder(self):
+            rec = PIDArrayRecorder(4)        # small; forces it to grow
+            h = PIDHistory(None)
+            z = PIDPlus(Kp=1.5, Ki=0.5, Kd=0.25,
+                        modifiers=(I_Windup(2), h, rec))
+            z.initial_conditions(pv=0, setpoint=1)
+            us = [z.pid(pv, dt=0.25) for pv in (0, 0.2, 0.5, 0.9, 1.2, 1)]
+
+            self.assertEqual(len(rec), len(us))
+            self.assertEqual(list(rec.u), us)
+            self.assertEqual(list(rec.t), [0.25 * n for n in range(1, 7)])
+            self.assertTrue(all(rec.sp == 1))
+            self.assertEqual(list(rec.pv), [0, 0.2, 0.5, 0.9, 1.2, 1])
+            self.assertTrue(all(rec.dt == 0.25))
+            calcs = [e for e in h.history if isinstance(e, PIDHookCalculateU)]
+            for a in ('e', 'p', 'i', 'd'):
+                with self.subTest(a=a):
+                    self.assertEqual(list(getattr(rec, a)),
+                                     [getattr(e, a) for e in calcs])
+
+            rec.clear()
+            self.assertEqual(len(rec), 0)
+            self.assertEqual(len(rec.u), 0)
+            with self.assertRaises(AttributeError):
+                _ = rec.bozo
+
         def test_hookstop(self):
             # test HookStop - a modifier asking to abort further notifications
             class Stopper(PIDModifier):